@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
-from scale_mod import Scale
+from scale_mod import Scale, BadNoteError
+from tuning import optimize
+from detect import detect, modulations, read_notes
+from midi import MidiFile, scan
+from temperament import cents, temperaments
+from contextlib import nullcontext
 import argparse
+import os
+import sys
 
 
 class Fretboard:
@@ -25,21 +32,85 @@ class Fretboard:
         self.scale_length = kwargs['scale_length']
         self.root = kwargs['root']
         self.scale_name = kwargs['scale']
+        self.temperament = kwargs.get('temperament')  # draws cents offsets
+        self.first_fret = kwargs.get('first_fret', 0)  # draw part of the neck
+        if not 0 <= self.first_fret < self.scale_length:
+            raise ValueError("The first fret must be on the neck, from 0 up to the length of the fretboard.")
+
+    @staticmethod
+    def cents_label(offset):
+        "a cents offset that fits in a cell, clamped to +/-99"
+        return "{:+d}".format(max(-99, min(99, round(offset))))
+
+    @staticmethod
+    def start_pitch_class(note):
+        """
+        the pitch class get_next's _Chromatic starts on: flats are stepped
+        down, E# and B# land on E and B, and the rest raise BadNoteError
+        """
+        tup = Scale._Note.parsestring(note)
+        name, acc = tup
+        if acc < 0:
+            name, acc = Scale._Note.step_down(tup)
+        if acc not in (0, 1):
+            raise BadNoteError(note)
+        if name in ('B', 'E'):
+            acc = 0
+        return Scale._Note.pitch_class((name, acc))
+
+    def columns(self, placeholder=None):
+        "one StringColumn per string, lowest first"
+        self.start_pitch_class(self.root)  # Scale can't start there either
+        sc_obj = Scale(root=self.root, scale=self.scale_name)
+        in_scale = sc_obj.pitch_classes()
+        # notes as get_next spells them: flat strings use flats
+        spelled = {}
+        for use_flats, start in ((False, 'C'), (True, 'Db')):
+            for note in Scale._Chromatic(start)._notes:
+                pc = Scale._Note.pitch_class(note.return_tuple())
+                spelled[use_flats, pc] = note
+        output = []
+        for open_note in self.tuning:
+            first = self.start_pitch_class(open_note)
+            flats = Scale._Note.parsestring(open_note)[1] < 0
+            period = []
+            for fret in range(12):
+                pc = (first + fret) % 12
+                if pc in in_scale:
+                    period.append(spelled[flats, pc])
+                else:
+                    period.append(placeholder)
+            output.append(StringColumn(period, self.scale_length))
+        return output
 
     def draw_fretboard(self):
         print('    ', end="")
-        strings = []
-        sc_obj = Scale(root=self.root, scale=self.scale_name)
-        for note in self.tuning:
-            strings.append(sc_obj.get_next(note))  # this is a generator
+        strings = self.columns()
+        if self.temperament is not None:
+            offsets = cents(self.tuning, self.scale_length, self.temperament, self.root)
         for note in strings:
-            out = next(note)
+            out = note[0]
             if out is None:
                 out = " "
             print("{0:^4}".format(str(out)), end="")
         print()
-        for y in range(self.scale_length):
-            if y in [0, 3, 5, 7, 9, 12]:
+        if self.temperament is not None:
+            # the open strings' cents offsets, under their names
+            print('    ', end="")
+            for x, note in enumerate(strings):
+                print("{0:^4}".format(self.cents_label(offsets[x][0])), end="")
+            print()
+        if self.first_fret > 0:
+            # the fret below the first one drawn
+            for x, note in enumerate(strings):
+                if x == 0:
+                    print("{0:>4}├".format(" "), end="")
+                if x == (len(strings)-1):
+                    print('{:─>4}'.format(self.normal_fret[3]))
+                else:
+                    print('{:─>4}'.format(self.normal_fret[2]), end="")
+        for y in range(self.first_fret, self.scale_length):
+            if y % 12 in [0, 3, 5, 7, 9]:
                 marker = y
             else:
                 marker = " "
@@ -52,27 +123,27 @@ class Fretboard:
                     else:
                         print('{:\u2501>4}'.format(self.zero_fret[2]), end="")
             else:
-                # create space
+                # create space, or the cents offset of each fret
                 for x, note in enumerate(strings):
                     if x == 0:
                         print("{0:>4}│".format(" "), end="")
+                    offset = " "
+                    if self.temperament is not None:
+                        offset = self.cents_label(offsets[x][y])
                     if x == (len(strings)-1):
-                        print('{:>4}'.format(self.normal_fret[4]))
+                        print('{:^3}{}'.format(offset, self.normal_fret[4]))
                     else:
-                        print('{:>4}'.format(self.normal_fret[4]), end="")
+                        print('{:^3}{}'.format(offset, self.normal_fret[4]), end="")
                 # create note 
                 for x, note in enumerate(strings):
                     if x == 0:
                         print("{0:>4}│".format(marker), end="")
+                    out = note[y]
+                    if out is None:
+                        out = " "
                     if x == (len(strings)-1):
-                        out = next(note)
-                        if out is None:
-                            out = " "
                         print('{:^3}{}'.format(str(out), self.normal_fret[4]))
                     else:
-                        out = next(note)
-                        if out is None:
-                            out = " "
                         print('{:^3}{}'.format(str(out), self.normal_fret[4]), end="")
                 # create fret
                 for x, note in enumerate(strings):
@@ -84,13 +155,64 @@ class Fretboard:
                         print('{:─>4}'.format(self.normal_fret[2]), end="")
 
 
-def argparse_setup():
+class StringColumn:
+    """
+    The notes of one string, fret by fret. A string repeats itself every
+    12 frets, so only one period is kept, and any fret is found directly.
+    """
+
+    def __init__(self, period, scale_length):
+        self._period = period
+        self.scale_length = scale_length
+
+    def __len__(self):
+        return self.scale_length
+
+    def __getitem__(self, fret):
+        if isinstance(fret, slice):
+            return [self[f] for f in range(*fret.indices(len(self)))]
+        if fret < 0:
+            fret += len(self)
+        if not 0 <= fret < len(self):
+            raise IndexError("fret out of range")
+        return self._period[fret % 12]
+
+    def __repr__(self):
+        return str(self._period)
+
+
+def split_tuning(tuning):
+    "split a tuning string like 'DADF#AD' into a list of notes"
+    notes = []
+    for char in tuning:
+        if char.isupper():
+            notes.append(char)
+        elif notes:
+            notes[-1] += char
+    return notes
+
+
+def argparse_setup(argv=None):
     "invoke argparse, passes to obj in global scope"
     parser = argparse.ArgumentParser(description="Creates a fretboard for learning scales and chords",epilog="Copyright 2021 - Eric Brauer")
     parser.add_argument("-r", "--root", default='C', help="Root note of the scale you are defining.")
     parser.add_argument("-s", "--scale", choices=list(Scale.get_scales()),  default='major', help="Name of the scale.")  # get possibles from Scale_mod
     parser.add_argument("-t", "--tuning", default='EADGBE', help="The tuning of the instrument.")
-    args = parser.parse_args()
+    parser.add_argument("-n", "--frets", type=int, default=13, help="Number of frets to draw, counting the open strings.")
+    parser.add_argument("-F", "--first-fret", type=int, default=0, help="First fret to draw, to show only part of the neck.")
+    parser.add_argument("-T", "--temperament", choices=list(temperaments), help="Show how far each fret is from equal temperament, in cents.")
+    parser.add_argument("-o", "--optimize", type=int, metavar='N', help="List the N tunings that play the scale with the smallest hand span.")
+    parser.add_argument("-d", "--detect", metavar='FILE', help="Report the likely root and scale of a file of notes, and where it modulates. Use - for stdin.")
+    parser.add_argument("-m", "--midi", metavar='PATH', help="Detect scales in a MIDI file, or summarize every MIDI file in a directory.")
+    parser.add_argument("-w", "--window", type=int, default=32, help="Number of notes in each window when detecting scales.")
+    args = parser.parse_args(argv)
+    tuning = split_tuning(args.tuning)
+    if not tuning or not all(Scale._Note.isvalid(n) for n in tuning):
+        parser.error("tuning must be note names, lowest first, eg. EADGBE or DADF#AD")
+    if not 0 <= args.first_fret < args.frets:
+        parser.error("--first-fret must be from 0 up to --frets")
+    if args.optimize is not None and args.optimize < 1:
+        parser.error("--optimize needs at least 1 tuning to list")
     return args
 
 
@@ -98,5 +220,26 @@ if __name__ == '__main__':
     args = argparse_setup()
     # scale_options = Scale.get_scales()
     print(args)
-    guitar = Fretboard(tuning=['E', 'A', 'D', 'G', 'B', 'E'], scale_length=13, root=args.root, scale=args.scale)  # anythin not C causing errors 
+    if args.optimize is not None:
+        tuning = split_tuning(args.tuning)
+        target = Scale(root=args.root, scale=args.scale)
+        for result in optimize([target], strings=len(tuning), lowest=tuning[0], top=args.optimize):
+            print("{:<24} span: {:<3} coverage: {}".format(' '.join(result.tuning), result.span, result.coverage))
+        raise SystemExit
+    if args.midi and os.path.isdir(args.midi):
+        for summary in scan(args.midi):
+            print("{}: {} {}".format(summary.path, summary.root, summary.scale) if summary.error is None else "{}: {}".format(summary.path, summary.error))
+        raise SystemExit
+    if args.midi:
+        with MidiFile(args.midi) as midi:
+            for found in modulations(detect(midi.notes(), window=args.window)):
+                print("{:>8}: {} {}".format(found.start, found.root, found.scale))
+        raise SystemExit
+    if args.detect:
+        # stdin is left open; a named file is closed when we are done with it
+        with nullcontext(sys.stdin) if args.detect == '-' else open(args.detect) as stream:
+            for found in modulations(detect(read_notes(stream), window=args.window)):
+                print("{:>8}: {} {}".format(found.start, found.root, found.scale))
+        raise SystemExit
+    guitar = Fretboard(tuning=['E', 'A', 'D', 'G', 'B', 'E'], scale_length=args.frets, root=args.root, scale=args.scale, temperament=args.temperament, first_fret=args.first_fret)  # anythin not C causing errors 
     guitar.draw_fretboard()
\ No newline at end of file
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+from collections import deque, namedtuple
+from operator import add, mul, sub
+from scale_mod import Scale
+
+
+'''
+Guess the root and scale of a stream of notes, one sliding window at a
+time. Every (root, scale) pair is a template of 12 weights:
+
+    2 for the root, 1 for the other notes of the scale, -1 for the rest
+
+A template's score is its weights dotted with the window's 12-bin pitch
+class histogram. Rather than rebuild the histogram, each note that
+enters or leaves the window adds or removes its own weight from every
+score, so nothing is ever recounted and memory stays the same however
+long the stream is.
+
+Ties go to the smaller scale, since it fits the notes more tightly.
+A major scale and its relative minor share their notes, so they tie
+whenever their roots are heard as often; the major key wins, as it
+does in a key signature. Only then do ties fall back to template order.
+Roots on black keys are named the way their keys usually are written,
+eg. B-flat major and C-sharp minor.
+'''
+
+
+Detection = namedtuple('Detection', ['start', 'end', 'root', 'scale',
+                                     'score'])
+
+_digits = '0123456789-'
+_scaled = 1024
+# black key roots named with flats: the rest are sharps
+_flat_roots = {'major': (1, 3, 8, 10), 'minor': (3, 10)}
+
+
+def _is_minor(scale):
+    "scales with a minor third and no major third are minor keys"
+    intervals = Scale.scales[scale]
+    return 'm3' in intervals and 'M3' not in intervals
+
+
+def root_name(root, scale):
+    "name a root pitch class the way the key is usually written"
+    name, acc = Scale._Note.from_pitch_class(root)
+    if root in _flat_roots['minor' if _is_minor(scale) else 'major']:
+        name, acc = Scale._Note.step_up((name, acc))
+        return name + 'b' * -acc
+    return name + '#' * acc
+
+
+def templates():
+    "a list of (root, scale, weights) for every root and scale"
+    output = []
+    for root in range(12):
+        for scale in Scale.get_scales():
+            weights = [-1] * 12
+            for semitones in Scale.get_semitones(scale):
+                weights[(root + semitones) % 12] = 1
+            weights[root] = 2
+            output.append((root_name(root, scale), scale, weights))
+    return output
+
+
+def _ties(table):
+    "rank templates for tie breaks: smaller, then major, then earlier"
+    ranks = [0] * len(table)
+    order = sorted(range(len(table)),
+                   key=lambda i: (-len(Scale.scales[table[i][1]]),
+                                  not _is_minor(table[i][1]), -i))
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return ranks
+
+
+def read_notes(stream):
+    """
+    generator for the notes in a text stream, eg. a file or stdin.
+    Notes are separated by whitespace and may carry an octave.
+    """
+    for line in stream:
+        for token in line.split():
+            yield token
+
+
+def pitch_classes(notes):
+    "generator that turns note names into pitch classes"
+    seen = {}
+    for note in notes:
+        if isinstance(note, int):
+            yield note
+            continue
+        try:
+            yield seen[note]
+        except KeyError:
+            tup = Scale._Note.parsestring(note.rstrip(_digits))
+            seen[note] = Scale._Note.pitch_class(tup)
+            yield seen[note]
+
+
+def detect(notes, window=32, hop=1):
+    """
+    generator of a Detection for every hop notes, once the first window
+    is full. notes can be names or pitch classes.
+    """
+    if window < 1 or hop < 1:
+        raise ValueError("window and hop must be at least 1.")
+    table = templates()
+    # Scores are stored scaled up, with the tie break added in the low
+    # bits, so the best template is simply the largest number.
+    scores = _ties(table)
+    # by_pc[pc] holds the scaled weight of pc in each template
+    by_pc = [[weights[pc] * _scaled for _, _, weights in table]
+             for pc in range(12)]
+    current = deque(maxlen=window)
+
+    position = 0
+    for pc in pitch_classes(notes):
+        if len(current) == window:
+            scores = list(map(sub, scores, by_pc[current[0]]))
+        current.append(pc)
+        scores = list(map(add, scores, by_pc[pc]))
+        position += 1
+        if len(current) == window and (position - window) % hop == 0:
+            top = max(scores)
+            root, scale, _ = table[scores.index(top)]
+            yield Detection(position - window, position, root, scale,
+                            top // _scaled)
+
+
+def best_scale(notes):
+    """
+    the Detection that best fits every note at once, eg. a whole file.
+    Returns None if there are no notes.
+    """
+    histogram = [0] * 12
+    for pc in pitch_classes(notes):
+        histogram[pc] += 1
+    total = sum(histogram)
+    if not total:
+        return None
+    table = templates()
+    scores = [sum(map(mul, histogram, weights)) for _, _, weights in table]
+    best = max(zip(scores, _ties(table), range(len(table))))[2]
+    root, scale, _ = table[best]
+    return Detection(0, total, root, scale, scores[best])
+
+
+def modulations(detections):
+    "generator for the detections where the root or scale changes"
+    previous = None
+    for found in detections:
+        if (found.root, found.scale) != previous:
+            previous = (found.root, found.scale)
+            yield found
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import random
+from collections import namedtuple
+from contextlib import redirect_stdout
+from scale_mod import Scale, BadNoteError
+from cli import Fretboard
+
+
+'''
+Run the original code paths and the faster ones side by side, and report
+the first place they disagree. The original paths are Scale.get_next,
+stepping one generator per string, and draw_fretboard as it was first
+written around those generators, which is kept here as the reference.
+
+An engine is any function that takes a Case and returns something that
+can be compared. Random tunings only use spellings the reference can
+start a string on, so nearly every case compares real output. The
+spellings it rejects, like C## and Fbb, get cases of their own, where
+both engines have to raise the same exception. The reference fails on
+those with an AttributeError; that one error is taken to mean the
+BadNoteError the fast engines raise, and nothing else is translated.
+Once a divergence is found it is shrunk, dropping strings and frets
+while it still diverges, so the reproducer is small. A Report counts the cases that compared
+output, so a run that compared next to nothing can't pass unnoticed.
+'''
+
+
+Case = namedtuple('Case', ['root', 'scale', 'tuning', 'scale_length'])
+Divergence = namedtuple('Divergence', ['engine', 'case', 'reference',
+                                       'fast', 'reproducer'])
+Report = namedtuple('Report', ['divergence', 'compared', 'raised'])
+
+accidentals = ('', '#', 'b', '##', 'bb')
+notes = [chr(n) + acc for n in range(ord('A'), ord('H'))
+         for acc in accidentals]
+
+
+def _unplaced(e):
+    """
+    is e the AttributeError the reference raises when _Chromatic can't
+    place its start note, because it never sets a pointer?
+    """
+    return isinstance(e, AttributeError) and "'pointer'" in str(e)
+
+
+def _accepted(note):
+    "can the reference start a chromatic scale on note?"
+    try:
+        Scale._Chromatic(note)
+    except AttributeError as e:
+        if not _unplaced(e):
+            raise
+        return False
+    return True
+
+
+playable = [n for n in notes if _accepted(n)]
+rejected = [n for n in notes if not _accepted(n)]
+
+
+def _fretboard(case):
+    return Fretboard(tuning=list(case.tuning), scale_length=case.scale_length,
+                     root=case.root, scale=case.scale)
+
+
+def reference_columns(case):
+    "the notes of every string, one generator per string"
+    sc_obj = Scale(root=case.root, scale=case.scale)
+    output = []
+    for note in case.tuning:
+        frets = sc_obj.get_next(note)
+        output.append([str(next(frets)) for y in range(case.scale_length)])
+    return output
+
+
+def fast_columns(case):
+    "the notes of every string, from Fretboard.columns"
+    return [[str(note) for note in column]
+            for column in _fretboard(case).columns()]
+
+
+def reference_draw(case):
+    "the fretboard as draw_fretboard first drew it, from generators"
+    self = _fretboard(case)
+    out = io.StringIO()
+    with redirect_stdout(out):
+        print('    ', end="")
+        strings = []
+        sc_obj = Scale(root=self.root, scale=self.scale_name)
+        for note in self.tuning:
+            strings.append(sc_obj.get_next(note))  # this is a generator
+        for note in strings:
+            out_note = next(note)
+            if out_note is None:
+                out_note = " "
+            print("{0:^4}".format(str(out_note)), end="")
+        print()
+        for y in range(self.scale_length):
+            if y in [0, 3, 5, 7, 9, 12]:
+                marker = y
+            else:
+                marker = " "
+            if y == 0:
+                for x, note in enumerate(strings):
+                    if x == 0:
+                        print("{0:>4}┍".format(marker), end="")
+                    if x == (len(self.tuning)-1):
+                        print('{:━>4}'.format(self.zero_fret[3]))
+                    else:
+                        print('{:━>4}'.format(self.zero_fret[2]), end="")
+            else:
+                # create space
+                for x, note in enumerate(strings):
+                    if x == 0:
+                        print("{0:>4}│".format(" "), end="")
+                    if x == (len(strings)-1):
+                        print('{:>4}'.format(self.normal_fret[4]))
+                    else:
+                        print('{:>4}'.format(self.normal_fret[4]), end="")
+                # create note
+                for x, note in enumerate(strings):
+                    if x == 0:
+                        print("{0:>4}│".format(marker), end="")
+                    out_note = next(note)
+                    if out_note is None:
+                        out_note = " "
+                    if x == (len(strings)-1):
+                        print('{:^3}{}'.format(str(out_note),
+                                               self.normal_fret[4]))
+                    else:
+                        print('{:^3}{}'.format(str(out_note),
+                                               self.normal_fret[4]), end="")
+                # create fret
+                for x, note in enumerate(strings):
+                    if x == 0:
+                        print("{0:>4}├".format(" "), end="")
+                    if x == (len(strings)-1):
+                        print('{:─>4}'.format(self.normal_fret[3]))
+                    else:
+                        print('{:─>4}'.format(self.normal_fret[2]), end="")
+    return _strip_markers(out.getvalue())
+
+
+def fast_draw(case):
+    "the fretboard as draw_fretboard draws it now"
+    out = io.StringIO()
+    with redirect_stdout(out):
+        _fretboard(case).draw_fretboard()
+    return _strip_markers(out.getvalue())
+
+
+def _strip_markers(drawing):
+    """
+    drop the fret numbers in the left margin: past fret 12 they now
+    repeat every octave, which the reference never did.
+    """
+    return [line[4:] for line in drawing.splitlines()]
+
+
+engines = {
+    'columns': (reference_columns, fast_columns),
+    'draw': (reference_draw, fast_draw),
+}
+
+
+def cases(seed=0, tunings=3, max_strings=8, max_frets=40):
+    """
+    generator of a Case for every root the reference accepts, including
+    double accidentals like Bbb, and every scale, each on a few random
+    tunings of accepted spellings and random fret counts.
+    """
+    rand = random.Random(seed)
+    for root in playable:
+        for scale in Scale.get_scales():
+            for _ in range(tunings):
+                tuning = tuple(rand.choice(playable) for _ in
+                               range(rand.randint(1, max_strings)))
+                yield Case(root, scale, tuning, rand.randint(1, max_frets))
+
+
+def rejected_cases(scale_length=13):
+    """
+    generator of a Case for every spelling the reference rejects, once
+    as the root and once as a string among accepted ones.
+    """
+    for note in rejected:
+        yield Case(note, 'major', ('E', 'A'), scale_length)
+        yield Case('C', 'major', ('E', note, 'A'), scale_length)
+
+
+def _run(engine, case, reference=False):
+    """
+    ('ok', output) or ('error', the exception's name). The reference's
+    one known AttributeError is reported as the BadNoteError the fast
+    engines raise for the same notes; the reference itself is unchanged.
+    """
+    try:
+        return ('ok', engine(case))
+    except Exception as e:
+        if reference and _unplaced(e):
+            return ('error', BadNoteError.__name__)
+        return ('error', type(e).__name__)
+
+
+def _diverges(reference, fast, case):
+    """
+    None if the engines agree, else both results. Raising counts as
+    agreeing only when both raise the same kind of exception.
+    """
+    ref, got = _run(reference, case, True), _run(fast, case)
+    if ref != got:
+        return ref, got
+    return None
+
+
+def _shrink(reference, fast, case):
+    "drop strings, then frets, while the engines still disagree"
+    shrinking = True
+    while shrinking:
+        shrinking = False
+        smaller = [case._replace(tuning=case.tuning[:i] + case.tuning[i+1:])
+                   for i in range(len(case.tuning)) if len(case.tuning) > 1]
+        smaller += [case._replace(scale_length=n)
+                    for n in (case.scale_length // 2, case.scale_length - 1)
+                    if 0 < n < case.scale_length]
+        for candidate in smaller:
+            if _diverges(reference, fast, candidate):
+                case = candidate
+                shrinking = True
+                break
+    return case
+
+
+def reproducer(name, case):
+    "python that shows one divergence"
+    return ("from equivalence import Case, engines\n"
+            "case = {!r}\n"
+            "reference, fast = engines[{!r}]\n"
+            "print(reference(case))\n"
+            "print(fast(case))\n").format(case, name)
+
+
+def compare(reference, fast, all_cases, name='engine'):
+    """
+    a Report of the first Divergence between two engines, shrunk, or
+    None, and how many cases compared output or raised in both.
+    """
+    compared = raised = 0
+    for case in all_cases:
+        ref, got = _run(reference, case, True), _run(fast, case)
+        if ref != got:
+            case = _shrink(reference, fast, case)
+            ref, got = _diverges(reference, fast, case)
+            found = Divergence(name, case, ref, got, reproducer(name, case))
+            return Report(found, compared, raised)
+        if ref[0] == 'ok':
+            compared += 1
+        else:
+            raised += 1
+    return Report(None, compared, raised)
+
+
+def check(seed=0, tunings=3, names=None):
+    """
+    compare every engine pair in engines, or just the ones named, on
+    cases() and rejected_cases(). Stops at the first divergence.
+    """
+    compared = raised = 0
+    for name in names or engines:
+        try:
+            reference, fast = engines[name]
+        except KeyError:
+            raise ValueError("Unknown engine: {}".format(name))
+        for all_cases in (cases(seed, tunings), rejected_cases()):
+            report = compare(reference, fast, all_cases, name)
+            compared += report.compared
+            raised += report.raised
+            if report.divergence is not None:
+                return Report(report.divergence, compared, raised)
+    return Report(None, compared, raised)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the reference and fast fretboard engines.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random tunings.")
+    parser.add_argument("--tunings", type=int, default=3, help="Random tunings for each root and scale.")
+    parser.add_argument("engine", nargs='*', help="Engines to compare, all by default.")
+    args = parser.parse_args()
+    report = check(args.seed, args.tunings, args.engine)
+    found = report.divergence
+    print("{} cases compared output, {} raised in both engines.".format(
+        report.compared, report.raised))
+    if found is None and not report.compared:
+        print("Nothing was compared.")
+        raise SystemExit(1)
+    elif found is None:
+        print("No divergence found.")
+    else:
+        print("{} diverges on {}".format(found.engine, found.case))
+        print("reference: {}".format(found.reference))
+        print("fast:      {}".format(found.fast))
+        print(found.reproducer)
+        raise SystemExit(1)
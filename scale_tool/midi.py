@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+import heapq
+import mmap
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from scale_mod import Scale
+from detect import best_scale
+from note_array import NoteArray
+
+
+'''
+Read standard MIDI files without any outside libraries.
+The file is memory-mapped and read through a memoryview, so nothing is
+copied, and each track is only decoded while its generator is running.
+Only note-on events are kept; everything else is skipped over.
+'''
+
+
+NoteOn = namedtuple('NoteOn', ['tick', 'track', 'channel', 'note',
+                               'velocity'])
+FileSummary = namedtuple('FileSummary', ['path', 'notes', 'root', 'scale',
+                                         'error'])
+
+DRUMS = 9  # channel 10, counting from 1
+# data bytes that follow each kind of channel message
+_data_length = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1,
+                0xE0: 2}
+
+
+def _names(octaves=True):
+    "note names for every MIDI note number, so 60 is C4 or just C"
+    output = []
+    for number in range(128):
+        name, acc = Scale._Note.from_pitch_class(number)
+        name += '#' * acc
+        if octaves:
+            name += str(number // 12 - 1)
+        output.append(name)
+    return output
+
+
+note_names = _names()
+pitch_names = _names(octaves=False)  # what Scale and Fretboard accept
+
+
+class BadMidiError(ValueError):
+    """the file isn't a standard MIDI file, or it is cut short"""
+    def __init__(self, path, *args):
+        self.message = "the file isn't a standard MIDI file, or it is cut "\
+                        + "short"
+        self.path = path
+        super(BadMidiError, self).__init__(self.message, self.path, *args)
+
+
+class MidiFile:
+    """
+    A standard MIDI file, mapped into memory. Use it as a context
+    manager, or call close() when done.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # can't map an empty file
+                raise BadMidiError(path)
+        self._view = memoryview(self._map)
+        if len(self._view) < 14 or self._view[:4] != b'MThd':
+            self.close()
+            raise BadMidiError(path)
+        length = self._int(4, 4)
+        self.format = self._int(8, 2)
+        self.ntracks = self._int(10, 2)
+        self.division = self._int(12, 2)
+        self._start = 8 + length
+        if length < 6 or self._start > len(self._view):
+            self.close()
+            raise BadMidiError(path)
+
+    def _int(self, offset, size):
+        "read a big-endian number"
+        if offset + size > len(self._view):
+            raise BadMidiError(self.path)
+        return int.from_bytes(self._view[offset:offset + size], 'big')
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def chunks(self):
+        """
+        generator for the (start, end) of each track's data. Raises
+        BadMidiError if the chunks don't fill the file exactly, or if there
+        aren't as many tracks as the header says.
+        """
+        offset = self._start
+        found = 0
+        while offset < len(self._view):
+            end = offset + 8 + self._int(offset + 4, 4)
+            if end > len(self._view):
+                raise BadMidiError(self.path)
+            if self._view[offset:offset + 4] == b'MTrk':
+                found += 1
+                yield offset + 8, end
+            offset = end
+        if found != self.ntracks:
+            raise BadMidiError(self.path)
+
+    def _track(self, number, start, end):
+        "generator for the note-on events of one track"
+        view = self._view
+        offset = start
+        tick = 0
+        status = None
+        try:
+            while offset < end:
+                delta = 0
+                while True:  # variable length delta time
+                    byte = view[offset]
+                    offset += 1
+                    delta = (delta << 7) | (byte & 0x7F)
+                    if byte < 0x80:
+                        break
+                tick += delta
+                if view[offset] >= 0x80:
+                    byte = view[offset]
+                    offset += 1
+                    if byte >= 0xF0:  # meta or sysex, no running status
+                        status = None
+                        if byte == 0xFF:
+                            offset += 1  # meta type
+                        length = 0
+                        while True:
+                            b = view[offset]
+                            offset += 1
+                            length = (length << 7) | (b & 0x7F)
+                            if b < 0x80:
+                                break
+                        offset += length
+                        continue
+                    status = byte
+                elif status is None:
+                    raise BadMidiError(self.path)
+                kind = status & 0xF0
+                if (kind == 0x90 and offset + 1 < end
+                        and view[offset + 1] > 0):
+                    yield NoteOn(tick, number, status & 0x0F, view[offset],
+                                 view[offset + 1])
+                offset += _data_length[kind]
+        except IndexError:
+            raise BadMidiError(self.path)
+        if offset > end:
+            raise BadMidiError(self.path)
+
+    def tracks(self):
+        "generator for a generator of note-on events per track"
+        for number, (start, end) in enumerate(self.chunks()):
+            yield self._track(number, start, end)
+
+    def note_ons(self):
+        "generator for the note-on events of all tracks, in time order"
+        return heapq.merge(*self.tracks())
+
+    def notes(self, drums=False, octaves=True):
+        """
+        generator for the names of every note played, eg. 'C#4'.
+        Without octaves the names are ones Scale and Fretboard take, eg. 'C#'.
+        """
+        names = note_names if octaves else pitch_names
+        for event in self.note_ons():
+            if drums or event.channel != DRUMS:
+                yield names[event.note]
+
+
+def positions(note, tuning, scale_length):
+    """
+    every (string, fret) that plays note, given a tuning with octaves,
+    eg. ['E2', 'A2', 'D3', 'G3', 'B3', 'E4'], and the number of frets.
+    """
+    if isinstance(note, str):
+        note = NoteArray.parse([note]).midi()[0]
+    output = []
+    for string, open_note in enumerate(NoteArray.parse(tuning).midi()):
+        fret = note - open_note
+        if 0 <= fret < scale_length:
+            output.append((string, fret))
+    return output
+
+
+def summarize(path):
+    "the scale that best fits a whole MIDI file"
+    try:
+        with MidiFile(path) as midi:
+            found = best_scale(n.note % 12 for n in midi.note_ons()
+                               if n.channel != DRUMS)
+    except (OSError, BadMidiError) as e:
+        error = getattr(e, 'message', str(e))
+        return FileSummary(path, 0, None, None, error)
+    if found is None:
+        return FileSummary(path, 0, None, None, None)
+    return FileSummary(path, found.end, found.root, found.scale, None)
+
+
+def midi_files(directory):
+    "generator for the paths of MIDI files anywhere under directory"
+    for parent, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith(('.mid', '.midi')):
+                yield os.path.join(parent, name)
+
+
+def scan(directory, workers=None):
+    "generator for a FileSummary of every MIDI file, using a process pool"
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for summary in pool.map(summarize, midi_files(directory),
+                                chunksize=16):
+            yield summary
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+from array import array
+from scale_mod import Scale
+
+
+'''
+Bulk operations on large runs of notes, eg. a whole songbook.
+Instead of one _Note object per note, a NoteArray keeps three compact
+integer arrays side by side:
+
+    pc:     pitch class, semitones above C (0-11)
+    octave: the written octave, where C4 is middle C
+    letter: the spelling, as an index into 'CDEFGAB'
+
+The accidental is whatever it takes to get from the letter to the pitch
+class, so E-flat and D-sharp share a pitch class but not a letter.
+Every operation works on whole arrays through small lookup tables.
+'''
+
+
+letters = 'CDEFGAB'
+_bases = [Scale._Note.letters[n] for n in letters]
+# _accidentals[letter][pc] is the accidental that spells pc with letter
+_accidentals = [[(pc - base + 6) % 12 - 6 for pc in range(12)]
+                for base in _bases]
+
+
+def _spell(letter, acc):
+    suffix = ''
+    if acc < 0:
+        suffix = '\u266d' * abs(acc)
+    elif acc > 0:
+        suffix = '\u266f' * acc
+    return letters[letter] + suffix
+
+
+def _interval(interval):
+    "split an interval name like 'M3' into semitones and letter steps"
+    for semitones, names in enumerate(Scale._Chromatic.intervals):
+        if interval in names:
+            return semitones, int(interval[1:]) - 1
+    raise ValueError("Unknown interval: {}".format(interval))
+
+
+class NoteArray:
+    """
+    A sequence of spelled notes with octaves, stored as integer arrays.
+    Indexing returns the note name with its octave, eg. 'E♭4'.
+    """
+
+    def __init__(self, pc=(), octave=(), letter=()):
+        self.pc = array('b', pc)
+        self.octave = array('b', octave)
+        self.letter = array('b', letter)
+        if not len(self.pc) == len(self.octave) == len(self.letter):
+            raise ValueError("pc, octave and letter must be the same length.")
+
+    @classmethod
+    def parse(cls, notes, octave=4):
+        """
+        Build a NoteArray from strings like 'C#', 'Eb3' or 'G♭5'.
+        Notes without an octave are put in the given one. Each distinct
+        string is only parsed once.
+        """
+        seen = {}
+        pcs, octaves, lets = array('b'), array('b'), array('b')
+        for note in notes:
+            try:
+                p, o, n = seen[note]
+            except KeyError:
+                name = note.rstrip('0123456789')
+                if name == note:
+                    o = octave
+                elif name[-1:] == '-':  # eg. C-1
+                    name = name[:-1]
+                    o = -int(note[len(name) + 1:])
+                else:
+                    o = int(note[len(name):])
+                n, acc = Scale._Note.parsestring(name)
+                p = Scale._Note.pitch_class((n, acc))
+                n = letters.index(n)
+                seen[note] = p, o, n
+            pcs.append(p)
+            octaves.append(o)
+            lets.append(n)
+        return cls(pcs, octaves, lets)
+
+    @classmethod
+    def from_midi(cls, numbers):
+        "build a NoteArray from MIDI note numbers, spelled with sharps"
+        pcs, octaves, lets = array('b'), array('b'), array('b')
+        spelled = [letters.index(Scale._Note.from_pitch_class(pc)[0])
+                   for pc in range(12)]
+        for number in numbers:
+            octave, pc = divmod(number, 12)
+            pcs.append(pc)
+            octaves.append(octave - 1)
+            lets.append(spelled[pc])
+        return cls(pcs, octaves, lets)
+
+    def accidentals(self):
+        "the accidental of each note, + for sharps, - for flats"
+        return array('b', [_accidentals[n][p]
+                           for p, n in zip(self.pc, self.letter)])
+
+    def midi(self):
+        "the MIDI note number of each note, so C4 is 60"
+        return array('h', [(o + 1) * 12 + _bases[n] + _accidentals[n][p]
+                           for p, o, n in zip(self.pc, self.octave,
+                                              self.letter)])
+
+    def _respelled(self, numbers, lets):
+        "octaves that keep the given pitches under their new letters"
+        octaves = array('b')
+        for number, n in zip(numbers, lets):
+            pc = number % 12
+            octaves.append((number - _bases[n] - _accidentals[n][pc])
+                           // 12 - 1)
+        return octaves
+
+    def transpose(self, interval, down=False):
+        """
+        Move every note by an interval. With an interval name like 'M3'
+        or 'd5' the spelling follows the interval, so E-flat up a major
+        third is G. With a number of semitones, notes are spelled with
+        sharps.
+        """
+        if isinstance(interval, int):
+            semitones = -interval if down else interval
+            return NoteArray.from_midi(n + semitones for n in self.midi())
+        semitones, steps = _interval(interval)
+        if down:
+            semitones, steps = -semitones, -steps
+        shift = [(pc + semitones) % 12 for pc in range(12)]
+        move = [(n + steps) % 7 for n in range(7)]
+        numbers = [n + semitones for n in self.midi()]
+        lets = array('b', [move[n] for n in self.letter])
+        return NoteArray(array('b', [shift[p] for p in self.pc]),
+                         self._respelled(numbers, lets), lets)
+
+    def respell(self, scale):
+        """
+        Spell every note that belongs to scale the way scale does,
+        eg. A-sharp becomes B-flat in F major. Other notes are left alone.
+        """
+        spelling = [None] * 12
+        for note in scale:
+            name, acc = note._pref_repr
+            spelling[Scale._Note.pitch_class((name, acc))] = \
+                letters.index(name)
+        lets = array('b', [n if spelling[p] is None else spelling[p]
+                           for p, n in zip(self.pc, self.letter)])
+        return NoteArray(self.pc, self._respelled(self.midi(), lets), lets)
+
+    def mask(self, scale):
+        "1 for each note that is in scale, 0 for the others"
+        table = [0] * 12
+        for pc in scale.pitch_classes():
+            table[pc] = 1
+        return array('b', [table[p] for p in self.pc])
+
+    def __len__(self):
+        return len(self.pc)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return NoteArray(self.pc[position], self.octave[position],
+                             self.letter[position])
+        n = self.letter[position]
+        return _spell(n, _accidentals[n][self.pc[position]]) \
+            + str(self.octave[position])
+
+    def __eq__(self, other):
+        "compare spelling and octave, note for note"
+        if not isinstance(other, NoteArray):
+            return NotImplemented
+        return (self.pc == other.pc and self.octave == other.octave
+                and self.letter == other.letter)
+
+    def __repr__(self):
+        return str([self[i] for i in range(len(self))])
@@ -119,6 +119,8 @@ class Scale:
         From this we can derive diatonic scales/chords.
         """
 
+        letters = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
         @classmethod
         def parsestring(cls, note):
             "will attempt to create a tuple of name/accidental, given a string"
@@ -137,6 +139,21 @@ class Scale:
                     raise BadNoteError(note)
             return (note_name, x)  # return as tuple
 
+        @classmethod
+        def pitch_class(cls, note_tup):
+            "eg. changes a D-flat into 1, counting semitones up from C"
+            notename, acc = note_tup
+            return (cls.letters[notename] + acc) % 12
+
+        @classmethod
+        def from_pitch_class(cls, pc):
+            "eg. changes 1 into a C-sharp. Sharps are preferred."
+            pc %= 12
+            for notename, semitones in cls.letters.items():
+                if semitones == pc:
+                    return (notename, 0)
+            return (cls.from_pitch_class(pc - 1)[0], 1)
+
         @classmethod
         def isvalid(cls, note):
             "check if a note is valid or not"
@@ -330,6 +347,11 @@ class Scale:
                     yield placeholder
 
 
+    def pitch_classes(self):
+        "return the notes of the diatonic scale as a set of pitch classes"
+        return frozenset(self._Note.pitch_class(n.return_tuple())
+                         for n in self.dia_scale)
+
     def index(self, note):
         "return the position of note"
         return self.dia_scale.index(note)
@@ -348,6 +370,17 @@ class Scale:
         "return the keys of the valid scales dict"
         return cls.scales.keys()
 
+    @classmethod
+    def get_semitones(cls, scale):
+        "return the intervals of a scale as semitones above the root"
+        try:
+            intervals = cls.scales[scale]
+        except KeyError:
+            raise BadScaleError(scale)
+        chromatic = cls._Chromatic.intervals
+        return [n for i in intervals
+                for n, names in enumerate(chromatic) if i in names]
+
     @classmethod
     def get_all_notes(cls):
         "return all possible notes of the Western scale"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+from array import array
+from functools import lru_cache
+from math import log2
+from scale_mod import Scale
+from note_array import NoteArray
+
+
+'''
+Pitch height and frequency for every fret of a fretboard.
+A temperament is 12 offsets in cents from equal temperament, one for each
+note counted up from the root of the key. Tables are built a whole string
+at a time and cached per (tuning, frets, temperament, root), so asking
+again for the same instrument costs a copy.
+'''
+
+
+class BadTemperamentError(ValueError):
+    """the temperament you defined isn't one that has been implemented yet"""
+    def __init__(self, temperament, *args):
+        self.message = "the temperament you defined isn't one that has "\
+                        + "been implemented yet"
+        self.temperament = temperament
+        super(BadTemperamentError, self).__init__(self.message,
+                                                  self.temperament, *args)
+
+
+_just_ratios = [1, 16/15, 9/8, 6/5, 5/4, 4/3, 45/32, 3/2, 8/5, 5/3, 9/5,
+                15/8]
+
+temperaments = {
+    'equal': (0.0,) * 12,
+    'just': tuple(1200 * log2(r) - 100 * i
+                  for i, r in enumerate(_just_ratios)),  # 5-limit
+}
+
+
+def pitches(tuning, octave=2):
+    """
+    MIDI note numbers for each string of a tuning, lowest first.
+    Strings may give an octave, eg. 'E2'. Strings that don't are put on
+    the first pitch above the string before, starting in octave.
+    """
+    output = []
+    for note in tuning:
+        if note[-1].isdigit():
+            output.append(NoteArray.parse([note]).midi()[0])
+            continue
+        number = NoteArray.parse([note], octave=octave).midi()[0]
+        if output:
+            while number <= output[-1]:
+                number += 12
+            while number - 12 > output[-1]:
+                number -= 12
+        output.append(number)
+    return output
+
+
+def offsets(temperament):
+    "the 12 cent offsets of a temperament, given by name or as a sequence"
+    if isinstance(temperament, str):
+        try:
+            return temperaments[temperament]
+        except KeyError:
+            raise BadTemperamentError(temperament)
+    temperament = tuple(float(c) for c in temperament)
+    if len(temperament) != 12:
+        raise BadTemperamentError(temperament)
+    return temperament
+
+
+@lru_cache(maxsize=1024)
+def _tables(numbers, scale_length, cents, root, a4):
+    "frequencies and cent offsets per string, from MIDI note numbers"
+    hz, off = [], []
+    for number in numbers:
+        # both repeat every 12 frets, the frequency an octave higher
+        period = [cents[(number + f - root) % 12] for f in range(12)]
+        ratios = [2 ** ((f * 100 + c) / 1200) for f, c in enumerate(period)]
+        base = a4 * 2 ** ((number - 69) / 12)
+        hz.append(array('d', [base * 2 ** (f // 12) * ratios[f % 12]
+                              for f in range(scale_length)]))
+        off.append(array('d', [period[f % 12]
+                               for f in range(scale_length)]))
+    return tuple(hz), tuple(off)
+
+
+def _lookup(tuning, scale_length, temperament, root, a4):
+    root = Scale._Note.pitch_class(Scale._Note.parsestring(root))
+    return _tables(tuple(pitches(tuning)), scale_length,
+                   offsets(temperament), root, a4)
+
+
+def frequencies(tuning, scale_length, temperament='equal', root='C',
+                a4=440.0):
+    """
+    the frequency in Hz of every fret, as one array per string.
+    root is the key that temperaments other than equal are tuned to.
+    """
+    hz, _ = _lookup(tuning, scale_length, temperament, root, a4)
+    return [array('d', string) for string in hz]
+
+
+def cents(tuning, scale_length, temperament='equal', root='C'):
+    "how far every fret is from equal temperament, one array per string"
+    _, off = _lookup(tuning, scale_length, temperament, root, 440.0)
+    return [array('d', string) for string in off]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from scale_mod import Scale
+
+
+'''
+Search for alternate tunings. A tuning is described by the note of its
+lowest string and the intervals (in semitones) between adjacent strings.
+Each candidate is scored against a set of target scales or chords:
+
+    span:     the smallest number of frets the fretting hand has to cover
+              to reach every note of a target, summed over all targets.
+    coverage: the number of positions in one octave of the neck where
+              every target can be played without stretching past max_span.
+
+Lower spans are better, and coverage breaks ties.
+'''
+
+
+TuningResult = namedtuple('TuningResult', ['tuning', 'intervals', 'span',
+                                           'coverage'])
+
+# windows[start][width] is a 12-bit mask of the pitch classes that one
+# string reaches between fret 'start' and fret 'start + width'.
+_windows = [[sum(1 << ((start + i) % 12) for i in range(width + 1))
+             for width in range(12)] for start in range(12)]
+
+
+def target_mask(target):
+    "turn a Scale, or a list of note names, into a 12-bit pitch class mask"
+    if isinstance(target, Scale):
+        pcs = target.pitch_classes()
+    else:
+        pcs = [Scale._Note.pitch_class(Scale._Note.parsestring(n))
+               for n in target]
+    mask = 0
+    for pc in pcs:
+        mask |= 1 << pc
+    return mask
+
+
+def _covered(pcs, start, width):
+    "pitch classes reached by every string in a window of frets"
+    mask = 0
+    for pc in pcs:
+        mask |= _windows[(pc + start) % 12][width]
+    return mask
+
+
+def hand_span(pcs, target):
+    "smallest fret window that holds every note of target"
+    for width in range(12):
+        for start in range(12):
+            if not target & ~_covered(pcs, start, width):
+                return width
+    return 12
+
+
+def position_coverage(pcs, targets, max_span):
+    "count the positions where every target fits within max_span frets"
+    count = 0
+    for start in range(12):
+        reach = _covered(pcs, start, max_span)
+        if all(not t & ~reach for t in targets):
+            count += 1
+    return count
+
+
+def _span_bound(pcs, target, remaining):
+    """
+    Lower bound on the span of any tuning that starts with pcs.
+    Each of the remaining strings can add at most width + 1 notes to a
+    window, so a window can't work until the missing notes fit in them.
+    """
+    for width in range(12):
+        for start in range(12):
+            missing = target & ~_covered(pcs, start, width)
+            if bin(missing).count('1') <= remaining * (width + 1):
+                return width
+    return 12
+
+
+def _result(pcs, intervals, targets, max_span, lowest):
+    "score a tuning, spelled with flats if its lowest string is flat"
+    tuning = [lowest]
+    flats = Scale._Note.parsestring(lowest)[1] < 0
+    for pc in pcs[1:]:
+        name, acc = Scale._Note.from_pitch_class(pc)
+        if flats and acc:
+            name, acc = Scale._Note.step_up((name, acc))
+        tuning.append(name + ('#' * acc if acc > 0 else 'b' * -acc))
+    span = sum(hand_span(pcs, t) for t in targets)
+    return TuningResult(tuning, list(intervals), span,
+                        position_coverage(pcs, targets, max_span))
+
+
+def _rank(result):
+    return (result.span, -result.coverage, result.intervals)
+
+
+def _search(args):
+    """
+    Depth-first branch and bound over the intervals that are left.
+    Keeps the best 'top' results and drops any branch whose bound is
+    already worse than the last of them. Branches are visited in interval
+    order, which is also the last tie break, so a branch that can only
+    tie the last result's span can't beat it once that has full coverage.
+    """
+    pcs, intervals, strings, choices, targets, max_span, top, lowest = args
+    best = []
+
+    def beaten(bound):
+        if len(best) < top:
+            return False
+        last = best[-1]
+        return bound > last.span or (bound == last.span
+                                     and last.coverage == 12)
+
+    def visit(pcs, intervals):
+        remaining = strings - len(pcs)
+        bound = sum(_span_bound(pcs, t, remaining) for t in targets)
+        if beaten(bound):
+            return
+        if not remaining:
+            best.append(_result(pcs, intervals, targets, max_span, lowest))
+            best.sort(key=_rank)
+            del best[top:]
+            return
+        for step in choices:
+            visit(pcs + [(pcs[-1] + step) % 12], intervals + [step])
+
+    visit(pcs, intervals)
+    return best
+
+
+def optimize(targets, strings=6, lowest='E', choices=range(3, 8),
+             max_span=4, top=10, workers=None):
+    """
+    Rank the tunings that start on 'lowest' by how easily they play
+    targets. The lowest string keeps the spelling it is given. Each target
+    is a Scale, or a list of note names for a chord.
+    choices are the intervals allowed between adjacent strings. The first
+    level of the search is split across a process pool; set workers=1 to
+    stay in this process.
+    """
+    if strings < 1:
+        raise ValueError("A tuning needs at least one string.")
+    masks = [target_mask(t) for t in targets]
+    root = Scale._Note.pitch_class(Scale._Note.parsestring(lowest))
+    choices = sorted(set(choices))
+    if strings == 1:
+        jobs = [([root], [], strings, choices, masks, max_span, top,
+                 lowest)]
+    else:
+        jobs = [([root, (root + step) % 12], [step], strings, choices, masks,
+                 max_span, top, lowest) for step in choices]
+    if workers == 1:
+        found = map(_search, jobs)
+        results = [r for batch in found for r in batch]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for batch in pool.map(_search, jobs) for r in batch]
+    results.sort(key=_rank)
+    return results[:top]
@@ -1,8 +1,11 @@
 #!/usr/bin/python3
+import io
 import sys
+from contextlib import redirect_stderr, redirect_stdout
 import unittest as unittest
 sys.path.append('../scale_tool')
-from cli import Fretboard 
+from cli import Fretboard, StringColumn, argparse_setup, split_tuning
+from scale_mod import Scale, BadNoteError
 
 
 class Test(unittest.TestCase):
@@ -19,5 +22,93 @@ class Test(unittest.TestCase):
         guitar = Fretboard(tuning=['E', 'A', 'D', 'G', 'B', 'E'], scale_length=12)
         guitar.draw_fretboard()
 
+    def test_drawing_cents(self):
+        guitar = Fretboard(tuning=['E', 'A', 'D', 'G', 'B', 'E'], scale_length=13,
+                           root='C', scale='major', temperament='just')
+        out = io.StringIO()
+        with redirect_stdout(out):
+            guitar.draw_fretboard()
+        self.assertIn('│-14│', out.getvalue())  # E, a just major third
+        self.assertEqual(out.getvalue().splitlines()[1], '    -14 -16  +4  +2 -12 -14 ')
+
+    def test_drawing_wide_cents(self):
+        "offsets of 100 cents or more are clamped to keep the grid"
+        guitar = Fretboard(tuning=['E', 'A'], scale_length=3, root='C',
+                           scale='major', temperament=[150] + [-250] * 11)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            guitar.draw_fretboard()
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1], '    -99 -99 ')
+        self.assertEqual(lines[3], '    │-99│-99│')
+        self.assertEqual(len(set(len(line) for line in lines[2:])), 1)
+
+    def test_columns(self):
+        "columns spell notes the way get_next does"
+        tuning = ['E', 'Bb', 'Db', 'F#', 'E#', 'B#', 'Cb']
+        for root in ('C', 'Db', 'F#', 'Bb'):
+            guitar = Fretboard(tuning=tuning, scale_length=30, root=root,
+                               scale='harmonic_minor')
+            scale = Scale(root=root, scale='harmonic_minor')
+            for column, open_note in zip(guitar.columns(), tuning):
+                notes = scale.get_next(open_note)
+                expected = [str(next(notes)) for fret in range(30)]
+                self.assertEqual([str(n) for n in column], expected)
+
+    def test_column_double_accidentals(self):
+        "get_next can't start a string on a double accidental either"
+        guitar = Fretboard(tuning=['E', 'C##'], scale_length=5, root='C',
+                           scale='major')
+        with self.assertRaises(BadNoteError):
+            guitar.columns()
+        guitar = Fretboard(tuning=['E'], scale_length=5, root='Fbb',
+                           scale='major')
+        with self.assertRaises(BadNoteError):
+            guitar.columns()
+
+    def test_column_lookup(self):
+        column = StringColumn(list(range(12)), 1000)
+        self.assertEqual(len(column), 1000)
+        self.assertEqual(column[999], 3)
+        self.assertEqual(column[-1], 3)
+        self.assertEqual(column[10:14], [10, 11, 0, 1])
+        with self.assertRaises(IndexError):
+            column[1000]
+
+    def test_drawing_part(self):
+        guitar = Fretboard(tuning=['E', 'A', 'D', 'G', 'B', 'E'], scale_length=37,
+                           root='C', scale='major', first_fret=34)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            guitar.draw_fretboard()
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 3 * 3)
+        self.assertEqual(lines[-2], '  36│ E │ A │ D │ G │ B │ E │')
+
+
+    def test_bad_first_fret(self):
+        for first in (-3, 13, 20):
+            with self.assertRaises(ValueError):
+                Fretboard(tuning=['E', 'A'], scale_length=13, root='C',
+                          scale='major', first_fret=first)
+
+    def test_split_tuning(self):
+        self.assertEqual(split_tuning('DADF#AD'), ['D', 'A', 'D', 'F#', 'A', 'D'])
+        self.assertEqual(split_tuning('eadgbe'), [])
+
+    def test_bad_args(self):
+        for argv in (['-t', 'eadgbe', '-o', '3'], ['-o', '0'], ['-t', 'EADGBH'],
+                     ['-F', '-3', '-n', '3'], ['-F', '3', '-n', '3']):
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                argparse_setup(argv)
+        self.assertEqual(argparse_setup(['-o', '2']).optimize, 2)
+
+    def test_detect_path(self):
+        "-d keeps the path, so nothing is opened until it is read"
+        self.assertEqual(argparse_setup(['-d', 'notes.txt']).detect,
+                         'notes.txt')
+        self.assertEqual(argparse_setup(['-d', '-']).detect, '-')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
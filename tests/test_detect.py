@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+import io
+import sys
+import unittest as unittest
+sys.path.append('../scale_tool')
+from scale_mod import BadNoteError
+from detect import (best_scale, detect, modulations, pitch_classes,
+                    read_notes, templates)
+
+
+class TestDetect(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.c_major = 'C4 D4 E4 F4 G4 A4 B4 C5 E4 G4'.split() * 4
+        self.g_major = 'G3 A3 B3 C4 D4 E4 F#4 G4 B3 D4'.split() * 4
+
+    def test_templates(self):
+        table = templates()
+        self.assertEqual(len(table), 12 * 9)
+        root, scale, weights = table[0]
+        self.assertEqual((root, scale), ('C', 'major'))
+        self.assertEqual(weights, [2, -1, 1, -1, 1, 1, -1, 1, -1, 1, -1, 1])
+
+    def test_root_names(self):
+        "flat keys are named with flats"
+        names = set((root, scale) for root, scale, _ in templates())
+        for key in (('Bb', 'major'), ('Eb', 'major'), ('Db', 'major'),
+                    ('F#', 'major'), ('Bb', 'minor'), ('C#', 'minor'),
+                    ('G#', 'harmonic_minor'), ('Ab', 'major_blues')):
+            self.assertIn(key, names)
+        self.assertNotIn(('A#', 'major'), names)
+
+    def test_relative_keys(self):
+        "a major key and its relative minor tie, and the major key wins"
+        for notes, key in (('Bb C D Eb F G A', ('Bb', 'major')),
+                           ('G A Bb C D Eb F', ('Bb', 'major')),
+                           ('D E F# G A B C#', ('D', 'major')),
+                           ('B C# D E F# G A', ('D', 'major'))):
+            found = list(detect(notes.split(), window=7))[0]
+            self.assertEqual((found.root, found.scale), key)
+
+    def test_minor_root(self):
+        "a minor key wins once its root is heard more"
+        found = list(detect('G A Bb C D Eb F G'.split(), window=8))[0]
+        self.assertEqual((found.root, found.scale), ('G', 'minor'))
+
+    def test_read_notes(self):
+        stream = io.StringIO("C4 Eb4\n\nG4  Bb4\n")
+        self.assertEqual(list(pitch_classes(read_notes(stream))),
+                         [0, 3, 7, 10])
+
+    def test_bad_note(self):
+        with self.assertRaises(BadNoteError):
+            list(detect(['C', 'H'], window=2))
+
+    def test_detect(self):
+        found = list(detect(self.c_major, window=20, hop=5))
+        self.assertEqual([f.start for f in found], [0, 5, 10, 15, 20])
+        for f in found:
+            self.assertEqual((f.root, f.scale), ('C', 'major'))
+
+    def test_smaller_scale(self):
+        "a pentatonic melody fits the pentatonic scale best"
+        found = list(detect('C D E G A'.split(), window=5))
+        self.assertEqual((found[0].root, found[0].scale),
+                         ('C', 'pentatonic_major'))
+
+    def test_pitch_classes(self):
+        "pitch classes give the same answer as note names"
+        names = list(detect(self.g_major, window=10))
+        numbers = list(detect(pitch_classes(self.g_major), window=10))
+        self.assertEqual(names, numbers)
+
+    def test_modulations(self):
+        found = list(modulations(detect(self.c_major + self.g_major,
+                                        window=20, hop=2)))
+        self.assertEqual([(f.root, f.scale) for f in found],
+                         [('C', 'major'), ('G', 'major')])
+        self.assertTrue(20 < found[1].end <= 60)
+
+    def test_best_scale(self):
+        "a whole stream agrees with a window that holds all of it"
+        best = best_scale(self.g_major)
+        window = list(detect(self.g_major, window=len(self.g_major)))[0]
+        self.assertEqual(best, window)
+        self.assertIsNone(best_scale([]))
+
+    def test_short_stream(self):
+        self.assertEqual(list(detect(['C', 'D'], window=4)), [])
+
+    def test_bad_window(self):
+        with self.assertRaises(ValueError):
+            list(detect(['C'], window=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+import io
+import sys
+import unittest as unittest
+from contextlib import redirect_stdout
+sys.path.append('../scale_tool')
+from equivalence import (Case, cases, check, compare, fast_columns,
+                         playable, rejected, rejected_cases,
+                         reference_columns)
+
+
+def sharp_columns(case):
+    "a broken fast engine that spells E# as F, as a fresh _Note would"
+    tuning = tuple('F' if n == 'E#' else n for n in case.tuning)
+    return fast_columns(case._replace(tuning=tuning))
+
+
+class TestEquivalence(unittest.TestCase):
+
+    def test_spellings(self):
+        self.assertEqual(len(playable) + len(rejected), 35)
+        self.assertIn('Bbb', playable)
+        self.assertEqual(sorted(rejected), ['A##', 'B##', 'C##', 'Cbb', 'D##',
+                                            'E##', 'F##', 'Fbb', 'G##'])
+
+    def test_cases(self):
+        "random cases only use spellings the reference accepts"
+        found = list(cases(tunings=1))
+        self.assertEqual(len(found), len(playable) * 9)
+        for case in found:
+            self.assertIn(case.root, playable)
+            for note in case.tuning:
+                self.assertIn(note, playable)
+        self.assertEqual(found, list(cases(tunings=1)))
+
+    def test_rejected_cases(self):
+        "every rejected spelling raises the same way in both engines"
+        found = list(rejected_cases())
+        self.assertEqual(len(found), 2 * len(rejected))
+        report = compare(reference_columns, fast_columns, found)
+        self.assertIsNone(report.divergence)
+        self.assertEqual((report.compared, report.raised), (0, len(found)))
+
+    def test_engines_agree(self):
+        "nearly every case compares real output"
+        report = check(seed=1, tunings=1)
+        self.assertIsNone(report.divergence)
+        self.assertEqual(report.compared, 2 * len(playable) * 9)
+        self.assertEqual(report.raised, 2 * 2 * len(rejected))
+
+    def test_spelling(self):
+        "flat roots and flat strings spell the way get_next does"
+        case = Case('Db', 'major', ('E', 'Bb', 'E#', 'Fb'), 14)
+        self.assertEqual(fast_columns(case), reference_columns(case))
+
+    def test_both_raise(self):
+        case = Case('C', 'major', ('C##',), 5)
+        report = compare(reference_columns, fast_columns, [case])
+        self.assertIsNone(report.divergence)
+        self.assertEqual((report.compared, report.raised), (0, 1))
+
+    def test_reference_unchanged(self):
+        "the reference still fails the way it always did"
+        with self.assertRaises(AttributeError):
+            reference_columns(Case('C##', 'major', ('E',), 5))
+        with self.assertRaises(AttributeError):
+            reference_columns(Case('C', 'major', ('C##',), 5))
+
+    def test_only_known_error_mapped(self):
+        "any other AttributeError from the reference is not translated"
+        def broken_reference(case):
+            raise AttributeError('something else')
+        case = Case('C', 'major', ('C##',), 5)
+        found = compare(broken_reference, fast_columns, [case]).divergence
+        self.assertEqual(found.reference, ('error', 'AttributeError'))
+        self.assertEqual(found.fast, ('error', 'BadNoteError'))
+
+    def test_different_errors(self):
+        "raising a different exception than the reference is a divergence"
+        def strict_columns(case):
+            if 'C##' in case.tuning:
+                raise ValueError(case)
+            return fast_columns(case)
+        case = Case('C', 'major', ('E', 'C##'), 5)
+        found = compare(reference_columns, strict_columns, [case]).divergence
+        self.assertEqual(found.reference, ('error', 'BadNoteError'))
+        self.assertEqual(found.fast, ('error', 'ValueError'))
+        self.assertEqual(found.case, Case('C', 'major', ('C##',), 1))
+
+    def test_divergence(self):
+        "the first divergence is shrunk to one string and one fret"
+        case = Case('C', 'major', ('A', 'E#', 'D', 'G'), 30)
+        found = compare(reference_columns, sharp_columns,
+                        [Case('C', 'major', ('E',), 5), case],
+                        'sharp').divergence
+        self.assertEqual(found.engine, 'sharp')
+        self.assertEqual(found.case, Case('C', 'major', ('E#',), 1))
+        self.assertEqual(found.reference, ('ok', [['E']]))
+        self.assertEqual(found.fast, ('ok', [['F']]))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            exec(found.reproducer.replace("engines['sharp']",
+                                          "engines['columns']"), {})
+        self.assertEqual(out.getvalue(), "[['E']]\n[['E']]\n")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            check(names=['gpu'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+import os
+import sys
+import tempfile
+import unittest as unittest
+sys.path.append('../scale_tool')
+from scale_mod import Scale
+from midi import BadMidiError, MidiFile, positions, scan, summarize
+
+
+def vlq(number):
+    "encode a variable length quantity"
+    output = [number & 0x7F]
+    number >>= 7
+    while number:
+        output.insert(0, (number & 0x7F) | 0x80)
+        number >>= 7
+    return bytes(output)
+
+
+def track(events):
+    data = b''.join(events) + b'\x00\xff\x2f\x00'  # end of track
+    return b'MTrk' + len(data).to_bytes(4, 'big') + data
+
+
+def midi_bytes(*tracks):
+    header = b'MThd' + (6).to_bytes(4, 'big') + (1).to_bytes(2, 'big') \
+        + len(tracks).to_bytes(2, 'big') + (96).to_bytes(2, 'big')
+    return header + b''.join(tracks)
+
+
+def scale_track(numbers, channel=0, step=96):
+    "note on / note off pairs, the note offs as note ons at velocity 0"
+    events = [b'\x00\xff\x03\x04name']  # a meta event to skip
+    for number in numbers:
+        events.append(b'\x00' + bytes([0x90 | channel, number, 64]))
+        events.append(vlq(step) + bytes([number, 0]))  # running status
+    return track(events)
+
+
+class TestMidi(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        g_major = [67, 69, 71, 72, 74, 76, 78, 79]
+        self.path = self.write('g.mid', midi_bytes(
+            scale_track(g_major),
+            scale_track([36, 37, 38, 39, 40, 41, 42], channel=9, step=200)))
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_header(self):
+        with MidiFile(self.path) as midi:
+            self.assertEqual((midi.format, midi.ntracks, midi.division),
+                             (1, 2, 96))
+            self.assertEqual(len(list(midi.chunks())), 2)
+
+    def test_note_ons(self):
+        "note ons at velocity 0 are note offs, and tracks merge by tick"
+        with MidiFile(self.path) as midi:
+            events = list(midi.note_ons())
+        self.assertEqual(len(events), 15)
+        self.assertEqual([e.tick for e in events],
+                         sorted(e.tick for e in events))
+        self.assertEqual(events[0].note, 67)
+        self.assertEqual(events[1].note, 36)
+        self.assertEqual(events[3].tick, 192)
+
+    def test_notes(self):
+        with MidiFile(self.path) as midi:
+            notes = list(midi.notes())
+        self.assertEqual(notes, ['G4', 'A4', 'B4', 'C5', 'D5', 'E5',
+                                 'F#5', 'G5'])
+
+    def test_pitch_names(self):
+        "names without octaves work with Scale"
+        with MidiFile(self.path) as midi:
+            notes = list(midi.notes(octaves=False))
+        self.assertEqual(notes, ['G', 'A', 'B', 'C', 'D', 'E', 'F#', 'G'])
+        scale = Scale(root='G', scale='major')
+        for note in notes:
+            self.assertIn(note, scale)
+
+    def test_bad_files(self):
+        good = midi_bytes(scale_track([60, 62]))
+        two_tracks = good[:10] + (2).to_bytes(2, 'big') + good[12:]
+        for data in (b'', b'RIFF' + bytes(20),
+                     midi_bytes(track([b'\x00\x90\x3c']))[:-6],
+                     good[:10],  # cut off inside the header
+                     b'MThd' + (0xffffff).to_bytes(4, 'big') + bytes(10),
+                     good + bytes(3),  # too short for a chunk header
+                     two_tracks):
+            with self.assertRaises(BadMidiError):
+                path = self.write('bad.mid', data)
+                with MidiFile(path) as midi:
+                    list(midi.note_ons())
+
+    def test_summarize(self):
+        summary = summarize(self.path)
+        self.assertEqual((summary.notes, summary.root, summary.scale),
+                         (8, 'G', 'major'))
+        self.assertIsNotNone(summarize(self.write('bad.mid', b'')).error)
+        header = b'MThd' + (0xffffff).to_bytes(4, 'big') + bytes(10)
+        self.assertIsNotNone(summarize(self.write('bad.mid', header)).error)
+
+    def test_scan(self):
+        os.mkdir(os.path.join(self.dir.name, 'sub'))
+        self.write(os.path.join('sub', 'c.MIDI'),
+                   midi_bytes(scale_track([60, 62, 64, 65, 67, 69, 71])))
+        self.write('notes.txt', b'C D E')
+        found = sorted(scan(self.dir.name, workers=2))
+        self.assertEqual([(os.path.basename(s.path), s.root, s.scale)
+                          for s in found],
+                         [('g.mid', 'G', 'major'), ('c.MIDI', 'C', 'major')])
+
+    def test_positions(self):
+        tuning = ['E2', 'A2', 'D3', 'G3', 'B3', 'E4']
+        self.assertEqual(positions('E2', tuning, 13), [(0, 0)])
+        self.assertEqual(positions(64, tuning, 13), [(3, 9), (4, 5), (5, 0)])
+        self.assertEqual(positions('Bb3', tuning, 24),
+                         [(0, 18), (1, 13), (2, 8), (3, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+import sys
+import unittest as unittest
+sys.path.append('../scale_tool')
+from scale_mod import Scale, BadNoteError
+from note_array import NoteArray
+
+
+class TestNoteArray(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.notes = NoteArray.parse(['C4', 'Eb', 'B#3', 'A#2', 'Cbb5'])
+
+    def test_parse(self):
+        self.assertEqual(list(self.notes.pc), [0, 3, 0, 10, 10])
+        self.assertEqual(list(self.notes.octave), [4, 4, 3, 2, 5])
+        self.assertEqual(list(self.notes.accidentals()), [0, -1, 1, 1, -2])
+        self.assertEqual(self.notes[1], 'E♭4')
+
+    def test_bad_note(self):
+        with self.assertRaises(BadNoteError):
+            NoteArray.parse(['C4', 'H2'])
+
+    def test_midi(self):
+        self.assertEqual(list(self.notes.midi()), [60, 63, 60, 46, 70])
+        self.assertEqual(NoteArray.from_midi([60, 61, 23]),
+                         NoteArray.parse(['C4', 'C#4', 'B0']))
+
+    def test_transpose_interval(self):
+        "spelling follows the interval"
+        up = NoteArray.parse(['Eb4', 'B3', 'F#4']).transpose('M3')
+        self.assertEqual(up, NoteArray.parse(['G4', 'D#4', 'A#4']))
+        down = up.transpose('M3', down=True)
+        self.assertEqual(down, NoteArray.parse(['Eb4', 'B3', 'F#4']))
+
+    def test_transpose_semitones(self):
+        up = self.notes.transpose(2)
+        self.assertEqual(list(up.midi()), [62, 65, 62, 48, 72])
+        self.assertEqual(up[1], 'F4')
+
+    def test_respell(self):
+        "A-sharp is B-flat in F major, and B-sharp is C in any case"
+        spelled = self.notes.respell(Scale(root='F', scale='major'))
+        self.assertEqual(spelled, NoteArray.parse(['C4', 'Eb4', 'C4', 'Bb2',
+                                                   'Bb4']))
+        self.assertEqual(spelled.midi(), self.notes.midi())
+
+    def test_mask(self):
+        mask = self.notes.mask(Scale(root='C', scale='minor'))
+        self.assertEqual(list(mask), [1, 1, 1, 1, 1])
+        mask = self.notes.mask(Scale(root='C', scale='major'))
+        self.assertEqual(list(mask), [1, 0, 1, 0, 0])
+
+    def test_slice(self):
+        self.assertEqual(self.notes[1:3], NoteArray.parse(['Eb4', 'B#3']))
+        self.assertEqual(len(self.notes[1:3]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+import sys
+import unittest as unittest
+sys.path.append('../scale_tool')
+from temperament import (BadTemperamentError, cents, frequencies, offsets,
+                         pitches, _tables)
+
+
+class TestTemperament(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.guitar = ['E2', 'A2', 'D3', 'G3', 'B3', 'E4']
+
+    def test_pitches(self):
+        self.assertEqual(pitches(self.guitar), [40, 45, 50, 55, 59, 64])
+        self.assertEqual(pitches(['E', 'A', 'D', 'G', 'B', 'E']),
+                         pitches(self.guitar))
+        self.assertEqual(pitches(['D2', 'A', 'D', 'F#', 'A', 'D']),
+                         [38, 45, 50, 54, 57, 62])
+        self.assertEqual(pitches(['Bb', 'Eb4']), [46, 63])
+
+    def test_equal(self):
+        hz = frequencies(self.guitar, 25)
+        self.assertEqual([len(s) for s in hz], [25] * 6)
+        self.assertAlmostEqual(hz[0][0], 82.407, places=3)
+        self.assertAlmostEqual(hz[0][12], hz[0][0] * 2)
+        self.assertAlmostEqual(hz[0][24], hz[0][0] * 4)
+        self.assertAlmostEqual(hz[5][5], 440.0)
+        self.assertAlmostEqual(hz[4][10], hz[5][5])
+        self.assertEqual(set(cents(self.guitar, 25)[3]), {0.0})
+
+    def test_just(self):
+        "just intonation in C: E is a pure major third, 5/4 above C"
+        hz = frequencies(self.guitar, 13, 'just', root='C')
+        self.assertAlmostEqual(hz[1][3] * 5 / 4, hz[2][2])
+        self.assertAlmostEqual(hz[1][3] * 3 / 2, hz[3][0])
+        off = cents(self.guitar, 13, 'just', root='C')
+        self.assertAlmostEqual(off[0][0], -13.686, places=3)
+        self.assertEqual(off[0][0], off[0][12])
+
+    def test_custom(self):
+        table = [0, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        off = cents(['C4'], 13, table, root='C')
+        self.assertEqual(list(off[0][:3]), [0.0, 10.0, 0.0])
+        off = cents(['C4'], 13, table, root='D')
+        self.assertEqual(off[0][3], 10.0)
+        hz = frequencies(['A4'], 2, [-100] + [0] * 11, root='A')
+        self.assertAlmostEqual(hz[0][0], 440.0 / 2 ** (1 / 12))
+
+    def test_bad_temperament(self):
+        for bad in ('pythagorean', [0] * 11):
+            with self.assertRaises(BadTemperamentError):
+                offsets(bad)
+
+    def test_cached(self):
+        "tables are shared, but callers get their own copies"
+        _tables.cache_clear()
+        first = frequencies(self.guitar, 13, 'just', root='G')
+        first[0][0] = 0
+        second = frequencies(self.guitar, 13, 'just', root='G')
+        self.assertNotEqual(second[0][0], 0)
+        self.assertEqual(_tables.cache_info().hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
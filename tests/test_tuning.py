@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+import sys
+import itertools
+import unittest as unittest
+sys.path.append('../scale_tool')
+from scale_mod import Scale
+from tuning import (hand_span, optimize, position_coverage, target_mask,
+                    _rank, _result)
+
+
+class TestScoring(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.c_major = target_mask(Scale(root='C', scale='major'))
+        self.standard = [4, 9, 2, 7, 11, 4]  # EADGBE
+
+    def test_mask(self):
+        self.assertEqual(target_mask(['C', 'E', 'G']), 0b10010001)
+        self.assertEqual(target_mask(['Db']), target_mask(['C#']))
+
+    def test_span(self):
+        "open position holds all of C major within frets 0-1"
+        self.assertEqual(hand_span(self.standard, self.c_major), 1)
+        self.assertEqual(hand_span([0], self.c_major), 10)
+
+    def test_coverage(self):
+        self.assertEqual(position_coverage(self.standard,
+                                           [self.c_major], 11), 12)
+        self.assertEqual(position_coverage([0], [self.c_major], 4), 0)
+
+
+class TestOptimize(unittest.TestCase):
+
+    def brute_force(self, targets, strings, choices, top):
+        "rank every tuning that starts on E"
+        masks = [target_mask(t) for t in targets]
+        expected = []
+        for steps in itertools.product(choices, repeat=strings - 1):
+            pcs = [4]
+            for step in steps:
+                pcs.append((pcs[-1] + step) % 12)
+            expected.append(_result(pcs, list(steps), masks, 4, 'E'))
+        expected.sort(key=_rank)
+        return expected[:top]
+
+    def test_matches_brute_force(self):
+        "branch and bound keeps the same winners as trying every tuning"
+        targets = [Scale(root='A', scale='pentatonic_minor'),
+                   ['D', 'F#', 'A']]
+        found = optimize(targets, strings=4, top=5, workers=1)
+        self.assertEqual(found, self.brute_force(targets, 4, range(3, 8), 5))
+
+    def test_ties(self):
+        "many tunings tie on span and full coverage; the first ones win"
+        targets = [Scale(root='C', scale='major')]
+        found = optimize(targets, strings=4, choices=range(1, 12), top=4,
+                         workers=1)
+        self.assertEqual(found,
+                         self.brute_force(targets, 4, range(1, 12), 4))
+
+    def test_pool(self):
+        targets = [Scale(root='G', scale='major')]
+        self.assertEqual(optimize(targets, strings=4, top=3),
+                         optimize(targets, strings=4, top=3, workers=1))
+
+    def test_lowest(self):
+        results = optimize([['C', 'E', 'G']], strings=3, lowest='Bb',
+                           workers=1)
+        for r in results:
+            self.assertEqual(r.tuning[0], 'Bb')
+            self.assertNotIn('#', ''.join(r.tuning))
+        results = optimize([['C', 'E', 'G']], strings=3, lowest='C#',
+                           workers=1)
+        self.assertEqual(results[0].tuning[0], 'C#')
+
+    def test_no_strings(self):
+        with self.assertRaises(ValueError):
+            optimize([['C']], strings=0)
+
+
+if __name__ == '__main__':
+    unittest.main()